@@ -8,7 +8,9 @@ This module handles all PostgreSQL database operations for:
 - Community strategies and voting
 """
 
+import asyncio
 import os
+import weakref
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from sqlalchemy import (
@@ -63,6 +65,11 @@ else:
     Base = declarative_base()
 
 
+# asyncpg connections are bound to the loop that opened them, so each event loop gets its
+# own engine (and connection pool), reused for every session on that loop
+_loop_session_factories = weakref.WeakKeyDictionary()
+
+
 def get_async_engine():
     """Create a new async engine for the current event loop."""
     if not DATABASE_URL:
@@ -84,13 +91,17 @@ def get_async_engine():
 
 
 def get_async_session():
-    """Create a new async session for the current event loop."""
-    engine = get_async_engine()
-    return sessionmaker(
-        engine,
-        class_=AsyncSession,
-        expire_on_commit=False
-    )()
+    """Create a new async session on the current event loop's pooled engine."""
+    loop = asyncio.get_running_loop()
+    session_factory = _loop_session_factories.get(loop)
+    if session_factory is None:
+        session_factory = sessionmaker(
+            get_async_engine(),
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+        _loop_session_factories[loop] = session_factory
+    return session_factory()
 
 
 # ==================== Models ====================
@@ -0,0 +1,65 @@
+"""
+Create an INT8 (dynamically quantized) copy of a Piper voice model.
+Run this script once, then point PIPER_MODEL at the generated *_int8.onnx file.
+
+Usage:
+  python quantize_piper_model.py [path/to/model.onnx]
+
+Defaults to PIPER_MODEL from the environment. INT8 weights are ~4x smaller and
+faster on CPUs with VNNI instructions; on CPUs without VNNI quantized inference
+can be slower than FP32, so keep the original model there.
+"""
+import os
+import sys
+import shutil
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def cpu_has_vnni():
+    """Check /proc/cpuinfo for AVX-VNNI / AVX512-VNNI support (Linux only)."""
+    try:
+        with open('/proc/cpuinfo') as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return 'avx512_vnni' in flags or 'avx_vnni' in flags
+
+
+model_path = Path(sys.argv[1] if len(sys.argv) > 1 else os.environ.get('PIPER_MODEL', './piper_models/es_MX-ald-medium.onnx'))
+
+if not model_path.exists():
+    print(f"❌ Piper model not found: {model_path}")
+    exit(1)
+
+# Piper loads its config from "<model>.onnx.json" next to the model
+config_path = Path(f"{model_path}.json")
+output_path = model_path.with_name(f"{model_path.stem}_int8.onnx")
+
+if not cpu_has_vnni():
+    print("⚠️  This CPU does not report VNNI support; the INT8 model may be slower than FP32 here.")
+
+try:
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+except ImportError:
+    print("❌ onnxruntime is not installed (it ships with piper-tts)")
+    exit(1)
+
+print(f"🔧 Quantizing {model_path} -> {output_path} ...")
+quantize_dynamic(
+    model_input=str(model_path),
+    model_output=str(output_path),
+    weight_type=QuantType.QInt8
+)
+
+if config_path.exists():
+    shutil.copy(config_path, f"{output_path}.json")
+else:
+    print(f"⚠️  Config {config_path} not found; copy it to {output_path}.json before using the model")
+
+original_mb = model_path.stat().st_size / (1024 * 1024)
+quantized_mb = output_path.stat().st_size / (1024 * 1024)
+print(f"✅ Done: {original_mb:.1f} MB -> {quantized_mb:.1f} MB")
+print(f"\nℹ️  Set PIPER_MODEL={output_path} to use it.")
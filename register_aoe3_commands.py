@@ -3,7 +3,10 @@ Register AoE3 slash commands with Discord.
 Run this script once to register commands, then they'll work via the interactions endpoint.
 """
 import os
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,6 +26,15 @@ headers = {
     "Content-Type": "application/json"
 }
 
+# Keep-alive session; retries rate limits and transient server errors (the PUT is idempotent)
+session = requests.Session()
+session.headers.update(headers)
+session.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=1,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
 # Define all AoE3 commands
 commands = [
     {
@@ -137,17 +149,20 @@ print("📝 Registering AoE3 slash commands with Discord...")
 print(f"App ID: {DISCORD_APP_ID}")
 print(f"Registering {len(commands)} commands...")
 
-# Register each command
-for command in commands:
-    print(f"\n  Registering: /{command['name']}")
-    response = requests.post(url, headers=headers, json=command)
-    
-    if response.status_code == 200 or response.status_code == 201:
+# Register all commands in one bulk-overwrite request (the same call the gateway bot's tree.sync() makes).
+# Note: this replaces the app's whole global command set with the list above.
+# Serialized once up front; the session already sends the JSON Content-Type header
+payload = orjson.dumps(commands)
+response = session.put(url, data=payload)
+
+if response.status_code == 200:
+    for command in response.json():
         print(f"  ✅ Success: /{command['name']}")
-    else:
-        print(f"  ❌ Failed: /{command['name']}")
-        print(f"  Status: {response.status_code}")
-        print(f"  Response: {response.text}")
+else:
+    print("  ❌ Failed to register commands")
+    print(f"  Status: {response.status_code}")
+    print(f"  Response: {response.text}")
+    exit(1)
 
 print("\n✅ Command registration complete!")
 print("\nℹ️  Commands may take up to 1 hour to appear globally.")
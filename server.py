@@ -1,16 +1,30 @@
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 import requests
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import threading
+import asyncio
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor
 import os
 import logging
-from datetime import datetime
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import atexit
+import time
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 import hmac
+import binascii
 import hashlib
 import random
+import functools
 import re
+from collections import Counter
+from itertools import islice
+from types import MappingProxyType
 
 # Use backports.zoneinfo for Python 3.8 compatibility
 try:
@@ -19,18 +33,31 @@ except ImportError:
     from backports.zoneinfo import ZoneInfo
 load_dotenv()
 
-# Optional official Google client for Generative AI (used if installed)
+# AoE3 slash command handler (light import: its database/scraper modules load on first use)
+from aoe3.interaction_handler import handle_aoe3_command
+
+# Optional official Google client for Generative AI (used if installed). The SDK is slow
+# to import and only used for the Gemini fallback, so skip it without GEMINI_API_KEY.
+genai = None
+if os.environ.get('GEMINI_API_KEY'):
+    try:
+        import google.generativeai as genai  # type: ignore
+    except Exception:
+        genai = None
+
+# PyNaCl (libsodium) for Discord's Ed25519 request signatures
 try:
-    import google.generativeai as genai  # type: ignore
-except Exception:
-    genai = None
+    from nacl.signing import VerifyKey
+    from nacl.exceptions import BadSignatureError
+except ImportError:
+    VerifyKey = None
 
 # For Discord signature verification
-def verify_discord_signature(public_key, signature, timestamp, body):
+def verify_discord_signature(verify_key, signature, timestamp, body):
     """Verify Discord's request signature using Ed25519
     
     Args:
-        public_key: DISCORD_PUBLIC_KEY from env (hex string for Ed25519 public key)
+        verify_key: PyNaCl VerifyKey built once from DISCORD_PUBLIC_KEY (None if unavailable)
         signature: X-Signature-Ed25519 header (hex string)
         timestamp: X-Signature-Timestamp header
         body: Raw request body bytes
@@ -38,57 +65,30 @@ def verify_discord_signature(public_key, signature, timestamp, body):
     Returns:
         True if signature is valid, False otherwise
     """
-    if not public_key or not signature or not timestamp:
+    if not verify_key or not signature or not timestamp:
         logger.warning("Missing signature components")
         return False
     
     try:
-        # Construct the message Discord signed (timestamp + body)
-        message = timestamp.encode() + body
+        # Construct the message Discord signed (timestamp + body); both headers are ASCII
+        message = timestamp.encode('ascii') + body
+        sig_bytes = binascii.unhexlify(signature)
 
-        # Convert hex strings to bytes
-        pk_bytes = bytes.fromhex(public_key)
-        sig_bytes = bytes.fromhex(signature)
-
-        # Try ed25519 module first (if available)
         try:
-            import ed25519
-            vk = ed25519.VerifyingKey(pk_bytes)
-            vk.verify(sig_bytes, message)
-            logger.debug("Discord signature verified successfully (ed25519)")
-            return True
-        except ImportError:
-            # ed25519 not installed; try PyNaCl
-            pass
-        except Exception as e:
-            logger.warning(f"ed25519 verification failed: {e}")
-
-        # Fallback to PyNaCl (nacl.signing)
-        try:
-            from nacl.signing import VerifyKey
-            from nacl.exceptions import BadSignatureError
-
-            vk = VerifyKey(pk_bytes)
             # Verify detached signature: VerifyKey.verify(message, signature)
-            vk.verify(message, sig_bytes)
+            verify_key.verify(message, sig_bytes)
             logger.debug("Discord signature verified successfully (PyNaCl)")
             return True
-        except ImportError:
-            logger.warning("Neither 'ed25519' nor 'PyNaCl' are installed for signature verification")
-            return False
         except BadSignatureError as bse:
             logger.warning(f"PyNaCl signature verification failed: {bse}")
             return False
-        except Exception as e:
-            logger.warning(f"Unexpected error during signature verification: {e}")
-            return False
 
     except Exception as e:
         logger.warning(f"Discord signature verification failed: {e}")
         return False
 
 
-def verify_key_decorator(public_key):
+def verify_key_decorator(verify_key):
     """Decorator to verify Discord request signatures on the /interactions endpoint."""
     def decorator(f):
         def wrapper(*args, **kwargs):
@@ -100,19 +100,20 @@ def verify_key_decorator(public_key):
             body = request.get_data()
             
             # Verify signature
-            valid = verify_discord_signature(public_key, signature, timestamp, body)
+            valid = verify_discord_signature(verify_key, signature, timestamp, body)
             if not valid:
-                # Log useful debugging info (do not log entire body in production)
-                body_preview = body[:1024] if body else b''
-                try:
-                    body_preview_text = body_preview.decode('utf-8', errors='replace')
-                except Exception:
-                    body_preview_text = str(body_preview)
-
                 logger.warning("Invalid Discord signature detected; rejecting request")
-                logger.debug("Signature header: %s", signature)
-                logger.debug("Timestamp header: %s", timestamp)
-                logger.debug("Request body (preview up to 1024 bytes): %s", body_preview_text)
+                # Log useful debugging info (do not log entire body in production); the
+                # preview decode only runs when DEBUG logging is on
+                if logger.isEnabledFor(logging.DEBUG):
+                    body_preview = body[:1024] if body else b''
+                    try:
+                        body_preview_text = body_preview.decode('utf-8', errors='replace')
+                    except Exception:
+                        body_preview_text = str(body_preview)
+                    logger.debug("Signature header: %s", signature)
+                    logger.debug("Timestamp header: %s", timestamp)
+                    logger.debug("Request body (preview up to 1024 bytes): %s", body_preview_text)
                 return jsonify({"error": "Invalid signature"}), 401
             
             return f(*args, **kwargs)
@@ -122,20 +123,117 @@ def verify_key_decorator(public_key):
     
     return decorator
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Tracebacks kept per second; past that, error records are logged without their traceback
+TRACEBACK_LOG_LIMIT = 10
+
+
+class TracebackRateLimiter(logging.Filter):
+    """Strip exc_info from records beyond `limit` tracebacks per `period` seconds.
+
+    The error line itself is always kept; the first traceback of the next window
+    reports how many were suppressed in between.
+    """
+
+    def __init__(self, limit, period=1.0):
+        super().__init__()
+        self.limit = limit
+        self.period = period
+        self.window_start = float('-inf')
+        self.count = 0
+        self.suppressed = 0
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if not record.exc_info:
+            return True
+        now = time.monotonic()
+        reported = 0
+        with self.lock:
+            if now - self.window_start >= self.period:
+                reported, self.suppressed = self.suppressed, 0
+                self.window_start, self.count = now, 0
+            self.count += 1
+            if self.count > self.limit:
+                self.suppressed += 1
+                record.exc_info = None
+                record.exc_text = None
+                return True
+        if reported:
+            record.msg, record.args = "%s (%d tracebacks suppressed before this one)", (record.getMessage(), reported)
+        return True
+
+
+class UnformattedQueueHandler(QueueHandler):
+    """QueueHandler that enqueues records as-is, leaving all formatting to the listener thread.
+
+    The stock prepare() formats the message (traceback included) on the logging thread so the
+    record can be pickled; the in-process queue doesn't need that.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+# Configure logging. Request and background threads only enqueue records; a listener thread
+# does the formatting (tracebacks included) and the stderr writes, so error storms don't stall
+# request threads. Log arguments are formatted late, so don't mutate them after logging.
+log_queue = queue.SimpleQueue()
+log_queue_handler = UnformattedQueueHandler(log_queue)
+log_queue_handler.addFilter(TracebackRateLimiter(TRACEBACK_LOG_LIMIT))
+log_stream_handler = logging.StreamHandler()
+log_stream_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[log_queue_handler])
+log_listener = QueueListener(log_queue, log_stream_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, so request.json and jsonify skip the stdlib json module."""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# Constant JSON bodies, serialized once; each request only wraps the bytes in a fresh Response
+ROOT_RESPONSE_BODY = orjson.dumps({"status": "ok", "service": "GolfoBot Flask Server"})
+NOT_FOUND_RESPONSE_BODY = orjson.dumps({"error": "Not found"})
+INTERNAL_ERROR_RESPONSE_BODY = orjson.dumps({"error": "Internal server error"})
+
+
+def static_json_response(body, status=200):
+    """Wrap pre-serialized JSON bytes in a response (Response objects are per-request, so never shared)."""
+    return app.response_class(body, status=status, mimetype='application/json')
 
 # Configuration
 DISCORD_PUBLIC_KEY = os.environ.get('DISCORD_PUBLIC_KEY')
+# Decode the public key once; every interaction webhook verifies against it
+DISCORD_VERIFY_KEY = None
+if DISCORD_PUBLIC_KEY:
+    if VerifyKey is None:
+        logger.warning("PyNaCl is not installed for signature verification")
+    else:
+        try:
+            DISCORD_VERIFY_KEY = VerifyKey(bytes.fromhex(DISCORD_PUBLIC_KEY))
+        except Exception as e:
+            logger.error(f"Invalid DISCORD_PUBLIC_KEY: {e}")
 DISCORD_BOT_TOKEN = os.environ.get('DISCORD_BOT_TOKEN')
 DISCORD_APP_ID = os.environ.get('DISCORD_APP_ID')
 DISCORD_CHANNEL_ID = os.environ.get('DISCORD_CHANNEL_ID')
+# Explicit bot user id for mention checks (optional)
+DISCORD_BOT_USER_ID = os.environ.get('DISCORD_BOT_USER_ID') or os.environ.get('BOT_USER_ID')
+# Rough bot id taken from the token's first segment, and its mention string
+BOT_TOKEN_ID = DISCORD_BOT_TOKEN.split('.')[0] if DISCORD_BOT_TOKEN else ''
+BOT_TOKEN_MENTION = f"<@{BOT_TOKEN_ID}>"
 
 # Test channel for development and chat interactions
 TEST_CHANNEL_ID = os.environ.get('TEST_CHANNEL_ID')
@@ -144,6 +242,13 @@ TEST_CHANNEL_ID = os.environ.get('TEST_CHANNEL_ID')
 # Falls back to DISCORD_CHANNEL_ID if not provided.
 ANNOUNCE_CHANNEL_ID = os.environ.get('ANNOUNCE_CHANNEL_ID')
 
+# Dev-only endpoints (/dev/*) are enabled with ALLOW_DEV_ENDPOINTS=1/true/yes
+ALLOW_DEV_ENDPOINTS = os.environ.get('ALLOW_DEV_ENDPOINTS', '').lower() in ('1', 'true', 'yes')
+
+# Moderator roles tagged on dangerous messages (either may be unset)
+GRAN_LIDER_ROLE_ID = os.environ.get('GRAN_LIDER_ROLE_ID')
+GENERAL_ROLE_ID = os.environ.get('GENERAL_ROLE_ID')
+
 # Gemini / Google Generative API configuration
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
 # Model name: defaults to 'gemini-2.5-flash' (latest, works with v1beta1 endpoint)
@@ -154,6 +259,95 @@ GEMINI_MODEL = os.environ.get('GEMINI_MODEL', 'gemini-2.5-flash')
 GROQ_API_KEY = os.environ.get('GROQ_API_KEY')
 GROQ_MODEL = os.environ.get('GROQ_MODEL', 'llama-3.3-70b-versatile')  # Latest Llama model
 
+# Longest server-supplied Retry-After (seconds) the adapters will sleep on a worker thread
+RETRY_AFTER_CAP = 5.0
+
+
+class CappedRetry(Retry):
+    """urllib3 Retry that honours Retry-After but never sleeps longer than RETRY_AFTER_CAP."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, RETRY_AFTER_CAP)
+
+
+# Shared HTTP session so calls to discord.com / api.groq.com reuse kept-alive TLS connections.
+# Discord calls are retried only on connect errors (nothing was sent) and 429s (nothing was
+# processed): read errors/timeouts and 5xx aren't, since a message create Discord already
+# accepted would post twice. Groq completions are also retried on 5xx and read errors.
+http_session = requests.Session()
+http_session.mount('https://', HTTPAdapter(
+    pool_connections=16, pool_maxsize=64,
+    max_retries=CappedRetry(total=3, read=0, other=0, backoff_factor=0.3, status_forcelist=(429,),
+                            allowed_methods=frozenset({'GET', 'POST', 'PATCH'}), raise_on_status=False)
+))
+http_session.mount('https://api.groq.com/', HTTPAdapter(
+    max_retries=CappedRetry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                            allowed_methods=frozenset({'POST'}), raise_on_status=False)
+))
+
+# Request headers built once and shared by every helper (read-only, since the worker
+# threads all use them)
+DISCORD_HEADERS = MappingProxyType({
+    "Authorization": f"Bot {DISCORD_BOT_TOKEN}",
+    "Content-Type": "application/json"
+})
+
+GROQ_HEADERS = MappingProxyType({
+    "Authorization": f"Bearer {GROQ_API_KEY}",
+    "Content-Type": "application/json"
+})
+
+# Bounded worker pool for work handed off after a webhook is acknowledged (LLM calls,
+# Discord posts), instead of a fresh thread per request; also caps concurrent outbound calls
+background_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='golfobot-bg')
+
+
+def _log_background_error(future):
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Background task failed", exc_info=exc)
+
+
+def run_in_background(fn, *args):
+    """Run fn(*args) on the background pool, logging any exception it raises.
+
+    Returns the future, or None if the pool rejected the task (interpreter shutting down);
+    handlers have already answered the webhook, so the rejection is only logged.
+    """
+    try:
+        future = background_executor.submit(fn, *args)
+    except RuntimeError as e:
+        logger.error(f"Background task {getattr(fn, '__name__', fn)} rejected: {e}")
+        return None
+    future.add_done_callback(_log_background_error)
+    return future
+
+
+# One long-lived event loop for the async AoE3 handlers, started on first use. Reusing it
+# avoids booting a loop per slash command, and keeps the database pool and the tasks the
+# handlers spawn on a single loop that keeps running between requests.
+aoe3_loop = None
+aoe3_loop_lock = threading.Lock()
+# Discord drops interaction responses that take longer than 3 seconds
+AOE3_COMMAND_TIMEOUT = 3.0
+
+
+def get_aoe3_loop():
+    """Return the shared AoE3 event loop, starting its daemon thread on first call."""
+    global aoe3_loop
+    with aoe3_loop_lock:
+        if aoe3_loop is None:
+            aoe3_loop = asyncio.new_event_loop()
+            threading.Thread(target=aoe3_loop.run_forever, name='aoe3-loop', daemon=True).start()
+    return aoe3_loop
+
+
+def utc_now_iso():
+    """Current UTC time as an ISO-8601 string with offset (for embed/health timestamps)."""
+    return datetime.now(timezone.utc).isoformat()
+
+
 # Note: we'll call Gemini (Google Generative API) via REST using an API key.
 # The GEMINI_API_KEY environment variable must be set to a valid API key.
 
@@ -172,68 +366,113 @@ BUTTON_CONFIGS = {
 }
 
 
-def get_button_config(custom_id):
-    """Get configuration for a specific button, with fallback to default"""
-    return BUTTON_CONFIGS.get(custom_id, {
+@functools.lru_cache(maxsize=256)
+def _default_button_config(custom_id):
+    """Fallback config for an unknown button, built once per custom_id (treat as read-only)"""
+    return {
         "prompt": f"The user clicked a button with ID: {custom_id}. Generate an appropriate response.",
         "acknowledgment": "Processing your request... ⏳",
         "include_user_mention": False
-    })
+    }
+
+
+def get_button_config(custom_id):
+    """Get configuration for a specific button, with fallback to default"""
+    return BUTTON_CONFIGS.get(custom_id) or _default_button_config(custom_id)
 
 
 # ===== MEXICAN PERSONA & HUMOR UTILITIES =====
 
+# Persona lines are module-level tuples so the helpers don't rebuild them on every call
+MEXICAN_GREETINGS = (
+    "¿Qué pasó mi rey/reina? 😎🌵",
+    "¡Ey, compa! ¿A qué se debe el honor? 🌶️",
+    "¡Órale! Habla, ¿qué se ofrece? 🎉",
+    "¿Qué me cuentas, jefe? 💪",
+    "¡Ay, mi lindo! ¿Me necesitabas? 🤠",
+)
+
+
 def get_mexican_greeting():
     """Return a random charismatic Mexican greeting"""
-    greetings = [
-        "¿Qué pasó mi rey/reina? 😎🌵",
-        "¡Ey, compa! ¿A qué se debe el honor? 🌶️",
-        "¡Órale! Habla, ¿qué se ofrece? 🎉",
-        "¿Qué me cuentas, jefe? 💪",
-        "¡Ay, mi lindo! ¿Me necesitabas? 🤠",
-    ]
-    return random.choice(greetings)
+    return random.choice(MEXICAN_GREETINGS)
+
+
+TEAM_FORMATION_RESPONSES = (
+    "Arre, compas. Déjenme los mezclo como si fueran carne pa' las carnitas… ¡Equipos listos! 🍖",
+    "Ya está, banda. Cada quien pa' su rancho. No se me pierdan. 🤠",
+    "¡Listo mi gente! Ya armé los equipos con más precisión que un jugador de póker en Las Vegas. 🎰",
+    "Compárenme a un chef mexicano, porque acabo de preparar unos equipos bien sabrosos. 👨‍🍳",
+    "¡Arre! Equipos armados como aguachiles — bien picosos y balanceados. 🌶️",
+)
 
 
 def get_team_formation_response(team_format):
     """Return a charismatic response when organizing teams"""
-    responses = {
-        "default": [
-            f"Arre, compas. Déjenme los mezclo como si fueran carne pa' las carnitas… ¡Equipos listos! 🍖",
-            f"Ya está, banda. Cada quien pa' su rancho. No se me pierdan. 🤠",
-            f"¡Listo mi gente! Ya armé los equipos con más precisión que un jugador de póker en Las Vegas. 🎰",
-            f"Compárenme a un chef mexicano, porque acabo de preparar unos equipos bien sabrosos. 👨‍🍳",
-            f"¡Arre! Equipos armados como aguachiles — bien picosos y balanceados. 🌶️",
-        ]
-    }
-    available = responses.get("default", [])
-    return random.choice(available) if available else "¡Equipos listos, jefas!"
+    return random.choice(TEAM_FORMATION_RESPONSES)
+
+
+MOVING_TO_CHANNELS_RESPONSES = (
+    "Ya está, banda. Cada quien pa' su rancho. No se me pierdan. 🎮",
+    "¡Órale! Ya los acomodé en sus canales. Que gane el mejor. 💪",
+    "Listo, compas. Mándenme los highlights después, ¿eh? 🎬",
+    "¡Ezo! Ya están en sus equipos. Ahora, a darle candela. 🔥",
+    "Cada quien con su escuadra. ¡Que empiece la batalla! ⚔️",
+)
 
 
 def get_moving_to_channels_response():
     """Return a charismatic response when moving users to voice channels"""
-    responses = [
-        "Ya está, banda. Cada quien pa' su rancho. No se me pierdan. 🎮",
-        "¡Órale! Ya los acomodé en sus canales. Que gane el mejor. 💪",
-        "Listo, compas. Mándenme los highlights después, ¿eh? 🎬",
-        "¡Ezo! Ya están en sus equipos. Ahora, a darle candela. 🔥",
-        "Cada quien con su escuadra. ¡Que empiece la batalla! ⚔️",
-    ]
-    return random.choice(responses)
+    return random.choice(MOVING_TO_CHANNELS_RESPONSES)
+
+
+ERROR_RESPONSES = (
+    "¡Ay, hermano! Me atascaste. Dame detalles claros, ¿sí? 🤔",
+    "Órale, necesito que me expliques bien de dónde se supone que debo agarrar gente. 🧐",
+    "Mi rey, algo no cuadra aquí. ¿Me das más info, porfa? 🤨",
+    "¡Ey, jefe! Creo que algo se perdió en la traducción. Cuéntame de nuevo. 📱",
+)
 
 
 def get_error_response_persona():
     """Return a humorous error response in persona"""
-    responses = [
-        "¡Ay, hermano! Me atascaste. Dame detalles claros, ¿sí? 🤔",
-        "Órale, necesito que me expliques bien de dónde se supone que debo agarrar gente. 🧐",
-        "Mi rey, algo no cuadra aquí. ¿Me das más info, porfa? 🤨",
-        "¡Ey, jefe! Creo que algo se perdió en la traducción. Cuéntame de nuevo. 📱",
-    ]
-    return random.choice(responses)
+    return random.choice(ERROR_RESPONSES)
 
 
 # ===== MEAN-MESSAGE DETECTION & ROASTING =====
+# Self-harm phrases: never roasted (is_mean_message) and always flagged for moderators
+SELF_HARM_PATTERNS = [
+    "kill yourself", "kys", "muérete", "muerete", "mátate", "matate"
+]
+# Everything that needs moderator attention: self-harm plus explicit threats
+DANGEROUS_PATTERNS = SELF_HARM_PATTERNS + [
+    "i will kill", "te voy a matar", "voy a matarte", "voy a matarlos"
+]
+
+# Conservative insult/profanity tokens (English + common Spanish variants)
+MEAN_TOKENS = [
+    "idiot", "stupid", "stfu", "shut up", "fuck", "fucking", "bitch",
+    "noob", "n00b", "trash", "sucks", "suck", "loser", "troll",
+    "pendejo", "cabron", "culero", "puta"
+]
+
+# Each token list compiled into one case-insensitive alternation, so a message is scanned
+# once instead of once per token (substring semantics are unchanged)
+DANGEROUS_REGEX = re.compile('|'.join(map(re.escape, DANGEROUS_PATTERNS)), re.IGNORECASE)
+SELF_HARM_REGEX = re.compile('|'.join(map(re.escape, SELF_HARM_PATTERNS)), re.IGNORECASE)
+MEAN_REGEX = re.compile('|'.join(map(re.escape, MEAN_TOKENS)), re.IGNORECASE)
+
+
+# Fallback local roast templates (keep them playful, not hateful)
+ROAST_FALLBACKS = (
+    "{mention}, ¿en serio? Me recuerda a cuando intentas hacer algo y terminas pidiendo tutoriales. 😏",
+    "¡Ay {mention}! Te escuché... pero mi abuela cocina mejor argumentos que tú. 😂",
+    "{mention}, tranquilo, que la vida no es un torneo y aún así pierdes la liga. 🤝",
+    "Hermano {mention}, baja dos rayitas — que aquí venimos a jugar, no a abrir heridas. 😅",
+    "{mention}, tu comentario tiene menos impacto que una notificación sin sonido. 🔕",
+)
+
+
 def is_mean_message(text):
     """Basic heuristic to detect mean/insulting messages.
 
@@ -242,37 +481,26 @@ def is_mean_message(text):
     abusive/mean but not when it contains explicit self-harm or violent
     threats (these are handled separately and will not be roasted).
     """
-    if not text:
+    # Nothing below can match fewer than 4 characters (shortest token, "!!!!")
+    if not text or len(text) < 4:
         return False
 
-    lower = text.lower()
-
-    # Patterns that indicate self-harm or explicit violent instructions.
-    # If present, do NOT roast — these should be handled differently.
-    dangerous_patterns = [
-        "kill yourself", "kys", "muérete", "muerete", "mátate", "matate"
-    ]
-    for p in dangerous_patterns:
-        if p in lower:
-            return False
-
-    # Conservative insult/profanity tokens (English + common Spanish variants)
-    mean_tokens = [
-        "idiot", "stupid", "stfu", "shut up", "fuck", "fucking", "bitch",
-        "noob", "n00b", "trash", "sucks", "suck", "loser", "troll",
-        "pendejo", "cabron", "culero", "puta"
-    ]
+    # Self-harm patterns: if present, do NOT roast — these should be handled differently.
+    if SELF_HARM_REGEX.search(text):
+        return False
 
     # Check token presence
-    for tok in mean_tokens:
-        if tok in lower:
-            return True
+    if MEAN_REGEX.search(text):
+        return True
 
-    # Heuristic: many repeated punctuation or ALL CAPS often signal aggression
-    if lower != text and sum(1 for c in text if c.isupper()) > max(10, len(text) // 3):
+    # Heuristic: many repeated punctuation or ALL CAPS often signal aggression.
+    # One C-level counting pass; isupper() then only runs once per distinct character,
+    # and only when the message is long enough to hold more than 10 capitals.
+    char_counts = Counter(text)
+    if len(text) > 10 and sum(n for c, n in char_counts.items() if c.isupper()) > max(10, len(text) // 3):
         return True
 
-    if text.count("!") >= 4 or text.count("?") >= 4:
+    if char_counts["!"] >= 4 or char_counts["?"] >= 4:
         return True
 
     return False
@@ -306,15 +534,8 @@ def get_roast_response(message_text, username=None):
     except Exception as e:
         logger.warning("LLM roast generation failed: %s", e)
 
-    # Fallback local roast templates (keep them playful, not hateful)
-    fallbacks = [
-        f"{mention}, ¿en serio? Me recuerda a cuando intentas hacer algo y terminas pidiendo tutoriales. 😏",
-        f"¡Ay {mention}! Te escuché... pero mi abuela cocina mejor argumentos que tú. 😂",
-        f"{mention}, tranquilo, que la vida no es un torneo y aún así pierdes la liga. 🤝",
-        f"Hermano {mention}, baja dos rayitas — que aquí venimos a jugar, no a abrir heridas. 😅",
-        f"{mention}, tu comentario tiene menos impacto que una notificación sin sonido. 🔕",
-    ]
-    return random.choice(fallbacks)
+    # Fallback local roast template; only the chosen one is formatted
+    return random.choice(ROAST_FALLBACKS).format(mention=mention)
 
 # ===== END MEAN-MESSAGE DETECTION & ROASTING =====
 
@@ -329,32 +550,20 @@ def is_dangerous_message(text):
     """
     if not text:
         return False
-    lower = text.lower()
+    return DANGEROUS_REGEX.search(text) is not None
 
-    dangerous_patterns = [
-        "kill yourself", "kys", "muérete", "muerete", "mátate", "matate",
-        "i will kill", "te voy a matar", "voy a matarte", "voy a matarlos"
-    ]
-    for p in dangerous_patterns:
-        if p in lower:
-            return True
-    return False
+
+# Built once from the role ids read at startup
+MODERATOR_MENTIONS = " ".join(f"<@&{role_id}>" for role_id in (GRAN_LIDER_ROLE_ID, GENERAL_ROLE_ID) if role_id)
 
 
 def get_moderator_mentions():
     """Return a string with moderator role mentions from env vars.
 
-    Looks for `GRAN_LIDER_ROLE_ID` and `GENERAL_ROLE_ID` environment variables.
+    Uses `GRAN_LIDER_ROLE_ID` and `GENERAL_ROLE_ID` (read once at startup).
     Only include roles that are set.
     """
-    mentions = []
-    gran = os.environ.get('GRAN_LIDER_ROLE_ID')
-    general = os.environ.get('GENERAL_ROLE_ID')
-    if gran:
-        mentions.append(f"<@&{gran}>")
-    if general:
-        mentions.append(f"<@&{general}>")
-    return " ".join(mentions)
+    return MODERATOR_MENTIONS
 
 # ===== END DANGEROUS MESSAGE DETECTION & MOD MENTION =====
 
@@ -362,6 +571,17 @@ def get_moderator_mentions():
 
 # ===== TEAM ORGANIZATION LOGIC =====
 
+# Team formats like "2v2", "3v3", "2v2v2v2"
+TEAM_FORMAT_REGEX = re.compile(r'(\d+)v(\d+)(?:v\d+)*', re.IGNORECASE)
+DIGITS_REGEX = re.compile(r'\d+')
+# Team organization commands ("arma los equipos", "mueve a los equipos", ...), on lowercased text.
+# Every match contains TEAM_COMMAND_KEYWORD, so callers test for it first and skip the regex.
+TEAM_COMMAND_KEYWORD = "equipo"
+TEAM_COMMAND_REGEX = re.compile(r'(arma|organiza|separa|mueve).*equipo')
+# Concurrent member-move PATCHes when placing players into team channels
+TEAM_MOVE_CONCURRENCY = 5
+
+
 def parse_team_format(text):
     """Parse team format from text (e.g., '2v2', '3v3', '2v2v2v2')
     
@@ -370,12 +590,12 @@ def parse_team_format(text):
         Example: '2v2' → (2, 2), '3v3' → (3, 2), '2v2v2v2' → (2, 4)
     """
     # Match patterns like "2v2", "3v3", "2v2v2v2", etc.
-    match = re.search(r'(\d+)v(\d+)(?:v\d+)*', text, re.IGNORECASE)
+    match = TEAM_FORMAT_REGEX.search(text)
     if not match:
         return None
     
     # Extract all team sizes: "2v2v2v2" → [2, 2, 2, 2]
-    team_sizes = re.findall(r'\d+', match.group(0))
+    team_sizes = DIGITS_REGEX.findall(match.group(0))
     team_sizes = [int(x) for x in team_sizes]
     
     # Check if all teams are same size
@@ -395,56 +615,48 @@ def get_voice_channel_members(guild_id):
     
     Returns:
         list: List of dicts with {'user_id': str, 'username': str, 'voice_channel_id': str}
+    
+    Note: the REST API doesn't expose which members are in voice; that needs the gateway
+    (gateway_bot.py handles voice team commands). Nothing is fetched here, since the guild
+    channel and member lists it used to download could not answer the question anyway.
     """
-    try:
-        # Fetch guild information to get voice channels
-        headers = {
-            "Authorization": f"Bot {DISCORD_BOT_TOKEN}",
-            "Content-Type": "application/json"
-        }
-        
-        # Get guild channels
-        resp = requests.get(
-            f"https://discord.com/api/v10/guilds/{guild_id}/channels",
-            headers=headers,
-            timeout=10
-        )
-        
-        if resp.status_code != 200:
-            logger.error(f"Failed to fetch guild channels: {resp.status_code}")
-            return []
-        
-        channels = resp.json()
-        voice_channels = [ch for ch in channels if ch.get('type') == 2]  # type 2 = voice
-        
-        members_in_voice = []
-        for voice_ch in voice_channels:
-            channel_id = voice_ch.get('id')
-            # Try to get channel details (includes voice state data in newer API)
-            # For now, we'll need to use a different approach or get guild members
-            pass
-        
-        # Get guild members who are in voice
-        # This is a simplified approach; in production, you'd use Discord.py or fetch from guild
-        resp_members = requests.get(
-            f"https://discord.com/api/v10/guilds/{guild_id}/members?limit=1000",
-            headers=headers,
-            timeout=10
-        )
-        
-        if resp_members.status_code != 200:
-            logger.error(f"Failed to fetch guild members: {resp_members.status_code}")
-            return []
-        
-        # Note: REST API doesn't directly expose which members are in voice.
-        # This would require a Discord.py bot or Gateway connection.
-        # For now, return empty and note this limitation.
-        logger.warning("Voice member detection requires Discord.py or Gateway connection")
-        return []
-        
-    except Exception as e:
-        logger.error(f"Error fetching voice channel members: {e}")
-        return []
+    logger.warning("Voice member detection requires Discord.py or Gateway connection")
+    return []
+
+
+def _create_team_channel(guild_id, team_number):
+    """Create the voice channel for one team; returns its ID or None on failure"""
+    ch_name = f"🎮 Equipo {team_number}"
+    create_resp = http_session.post(
+        f"https://discord.com/api/v10/guilds/{guild_id}/channels",
+        headers=DISCORD_HEADERS,
+        data=orjson.dumps({
+            "name": ch_name,
+            "type": 2,  # Voice channel
+            "position": team_number - 1
+        }),
+        timeout=10
+    )
+    if create_resp.status_code in (200, 201):
+        new_ch = orjson.loads(create_resp.content)
+        logger.info(f"Created new team channel: {ch_name} ({new_ch['id']})")
+        return new_ch['id']
+    logger.error(f"Failed to create team channel {ch_name}: {create_resp.status_code}")
+    return None
+
+
+# Team voice channel IDs per guild: guild_id -> (expires_at, {team_number: channel_id}).
+# Back-to-back team commands reuse them instead of re-listing every guild channel; a
+# failed member move drops the entry in case a channel was deleted.
+team_channel_cache = {}
+team_channel_cache_lock = threading.Lock()
+TEAM_CHANNEL_CACHE_TTL = 600  # seconds
+
+
+def invalidate_team_channels(guild_id):
+    """Forget the cached team channel IDs for a guild."""
+    with team_channel_cache_lock:
+        team_channel_cache.pop(guild_id, None)
 
 
 def create_or_get_team_channels(guild_id, num_teams, base_channel_id=None):
@@ -453,19 +665,19 @@ def create_or_get_team_channels(guild_id, num_teams, base_channel_id=None):
     Returns:
         list: List of channel IDs for each team
     """
+    with team_channel_cache_lock:
+        cached = team_channel_cache.get(guild_id)
+    if cached and cached[0] > time.monotonic() and all(i in cached[1] for i in range(1, num_teams + 1)):
+        return [cached[1][i] for i in range(1, num_teams + 1)]
+    
     try:
-        headers = {
-            "Authorization": f"Bot {DISCORD_BOT_TOKEN}",
-            "Content-Type": "application/json"
-        }
-        
         # Get or create category for team channels
         category_name = "🏆 Team Channels"
         
         # Fetch guild channels
-        resp = requests.get(
+        resp = http_session.get(
             f"https://discord.com/api/v10/guilds/{guild_id}/channels",
-            headers=headers,
+            headers=DISCORD_HEADERS,
             timeout=10
         )
         
@@ -473,35 +685,37 @@ def create_or_get_team_channels(guild_id, num_teams, base_channel_id=None):
             logger.error(f"Failed to fetch channels: {resp.status_code}")
             return []
         
-        channels = resp.json()
+        channels = orjson.loads(resp.content)
+        
+        # Index voice channels by name once (first match wins, as before)
+        voice_by_name = {}
+        for ch in channels:
+            if ch.get('type') == 2:
+                voice_by_name.setdefault(ch.get('name'), ch)
         
         # Look for existing category or voice channels
-        team_channels = []
+        channel_ids = {}
+        missing = []
         for i in range(1, num_teams + 1):
             ch_name = f"🎮 Equipo {i}"
-            existing = next((ch for ch in channels if ch.get('name') == ch_name and ch.get('type') == 2), None)
+            existing = voice_by_name.get(ch_name)
             if existing:
-                team_channels.append(existing['id'])
+                channel_ids[i] = existing['id']
                 logger.info(f"Using existing team channel: {ch_name} ({existing['id']})")
             else:
-                # Create new channel
-                create_resp = requests.post(
-                    f"https://discord.com/api/v10/guilds/{guild_id}/channels",
-                    headers=headers,
-                    json={
-                        "name": ch_name,
-                        "type": 2,  # Voice channel
-                        "position": i - 1
-                    },
-                    timeout=10
-                )
-                if create_resp.status_code in (200, 201):
-                    new_ch = create_resp.json()
-                    team_channels.append(new_ch['id'])
-                    logger.info(f"Created new team channel: {ch_name} ({new_ch['id']})")
-                else:
-                    logger.error(f"Failed to create team channel {ch_name}: {create_resp.status_code}")
-        
+                missing.append(i)
+        
+        # Create the missing channels concurrently (a dedicated pool, since this may already
+        # run on background_executor)
+        if missing:
+            with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+                for i, ch_id in zip(missing, pool.map(lambda n: _create_team_channel(guild_id, n), missing)):
+                    if ch_id:
+                        channel_ids[i] = ch_id
+        
+        team_channels = [channel_ids[i] for i in sorted(channel_ids)]
+        with team_channel_cache_lock:
+            team_channel_cache[guild_id] = (time.monotonic() + TEAM_CHANNEL_CACHE_TTL, channel_ids)
         return team_channels
         
     except Exception as e:
@@ -515,15 +729,10 @@ def move_user_to_channel(user_id, guild_id, channel_id):
     Note: Requires user to be in a voice channel already
     """
     try:
-        headers = {
-            "Authorization": f"Bot {DISCORD_BOT_TOKEN}",
-            "Content-Type": "application/json"
-        }
-        
-        resp = requests.patch(
+        resp = http_session.patch(
             f"https://discord.com/api/v10/guilds/{guild_id}/members/{user_id}",
-            headers=headers,
-            json={"channel_id": channel_id},
+            headers=DISCORD_HEADERS,
+            data=orjson.dumps({"channel_id": channel_id}),
             timeout=10
         )
         
@@ -556,11 +765,6 @@ def call_llm(prompt, max_tokens=1000):
     # Try Groq first (faster and more generous free tier)
     if GROQ_API_KEY:
         try:
-            headers = {
-                "Authorization": f"Bearer {GROQ_API_KEY}",
-                "Content-Type": "application/json"
-            }
-            
             payload = {
                 "model": GROQ_MODEL,
                 "messages": [
@@ -570,15 +774,15 @@ def call_llm(prompt, max_tokens=1000):
                 "temperature": 0.7
             }
             
-            response = requests.post(
+            response = http_session.post(
                 "https://api.groq.com/openai/v1/chat/completions",
-                headers=headers,
-                json=payload,
+                headers=GROQ_HEADERS,
+                data=orjson.dumps(payload),
                 timeout=10
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 return data['choices'][0]['message']['content']
             else:
                 logger.warning(f"Groq API returned {response.status_code}: {response.text}")
@@ -652,11 +856,6 @@ def call_llm(prompt, max_tokens=1000):
 
 def post_to_discord(channel_id, content, embeds=None, components=None):
     """Post a message to Discord with error handling"""
-    headers = {
-        "Authorization": f"Bot {DISCORD_BOT_TOKEN}",
-        "Content-Type": "application/json"
-    }
-    
     payload = {"content": content}
     if embeds:
         payload["embeds"] = embeds
@@ -666,10 +865,10 @@ def post_to_discord(channel_id, content, embeds=None, components=None):
     if components:
         payload["components"] = components
     
-    response = requests.post(
+    response = http_session.post(
         f"https://discord.com/api/v10/channels/{channel_id}/messages",
-        headers=headers,
-        json=payload,
+        headers=DISCORD_HEADERS,
+        data=orjson.dumps(payload),
         timeout=10
     )
     
@@ -684,23 +883,40 @@ def post_to_discord(channel_id, content, embeds=None, components=None):
 
 def update_interaction_message(interaction_token, content):
     """Update the original interaction message (the ephemeral one)"""
-    headers = {
-        "Authorization": f"Bot {DISCORD_BOT_TOKEN}",
-        "Content-Type": "application/json"
-    }
-    
     payload = {"content": content}
     
-    response = requests.patch(
+    response = http_session.patch(
         f"https://discord.com/api/v10/webhooks/{DISCORD_APP_ID}/{interaction_token}/messages/@original",
-        headers=headers,
-        json=payload,
+        headers=DISCORD_HEADERS,
+        data=orjson.dumps(payload),
         timeout=10
     )
     
     return response.status_code == 200
 
 
+# Announcement prompts for the weekly stream buttons (constant; built once at import)
+STREAM_YES_PROMPT = (
+    "Eres un asistente creativo que escribe anuncios cortos en español para una comunidad "
+    "de videojuegos llamada 'Revolucionarios' que se dedican a jugar Age of Empires III: Definitive Edition. Escribe un anuncio amistoso, fresco y con humor "
+    "(emojis permitidos) anunciando que Golfo de México va a hacer un stream en vivo para el "
+    "RevoWeekend. Mantén el tono cercano y divertido, menciona a los 'Revolucionarios', incluye una "
+    "llamada a la acción para que la gente se una, y asegúrate de que el texto sea adecuado para "
+    "publicar en Discord. Devuelve sólo el texto del anuncio (sin explicaciones adicionales)."
+)
+STREAM_NO_PROMPT = (
+    "Eres un asistente creativo que escribe anuncios cortos en español para una comunidad "
+    "de videojuegos llamada 'Revolucionarios' que se dedican a jugar Age of Empires III: Definitive Edition. Escribe un anuncio con tono apenado y melancólico, "
+    "pero respetuoso y cercano, comunicando que Golfo de México NO podrá hacer el stream del "
+    "RevoWeekend. Incluye un toque de humor suave para atenuar la decepción, menciona a los "
+    "'Revolucionarios', y sugiere mantenerse atentos a futuros anuncios. Devuelve sólo el texto "
+    "del anuncio (sin explicaciones adicionales)."
+)
+
+
+BUTTON_RESPONSE_FOOTER = {"text": "RevoWeekend Stream Check"}
+
+
 def process_button_click(custom_id, user_id, username, interaction_token=None):
     """
     Background task to process button click with LLM and post to user's DM.
@@ -709,6 +925,11 @@ def process_button_click(custom_id, user_id, username, interaction_token=None):
     try:
         logger.info(f"Processing button click: {custom_id} by {username} ({user_id})")
         
+        # Open (and cache) the user's DM channel while the LLM call below runs, so the
+        # confirmation DM skips that round trip
+        if user_id:
+            run_in_background(open_dm_channel, user_id)
+        
         # Get button configuration
         config = get_button_config(custom_id)
         
@@ -724,23 +945,9 @@ def process_button_click(custom_id, user_id, username, interaction_token=None):
         # If the LLM fails for any reason, fall back to a safe template message.
         try:
             if 'yes' in custom_id.lower():
-                prompt = (
-                    "Eres un asistente creativo que escribe anuncios cortos en español para una comunidad "
-                    "de videojuegos llamada 'Revolucionarios' que se dedican a jugar Age of Empires III: Definitive Edition. Escribe un anuncio amistoso, fresco y con humor "
-                    "(emojis permitidos) anunciando que Golfo de México va a hacer un stream en vivo para el "
-                    "RevoWeekend. Mantén el tono cercano y divertido, menciona a los 'Revolucionarios', incluye una "
-                    "llamada a la acción para que la gente se una, y asegúrate de que el texto sea adecuado para "
-                    "publicar en Discord. Devuelve sólo el texto del anuncio (sin explicaciones adicionales)."
-                )
+                prompt = STREAM_YES_PROMPT
             elif 'no' in custom_id.lower():
-                prompt = (
-                    "Eres un asistente creativo que escribe anuncios cortos en español para una comunidad "
-                    "de videojuegos llamada 'Revolucionarios' que se dedican a jugar Age of Empires III: Definitive Edition. Escribe un anuncio con tono apenado y melancólico, "
-                    "pero respetuoso y cercano, comunicando que Golfo de México NO podrá hacer el stream del "
-                    "RevoWeekend. Incluye un toque de humor suave para atenuar la decepción, menciona a los "
-                    "'Revolucionarios', y sugiere mantenerse atentos a futuros anuncios. Devuelve sólo el texto "
-                    "del anuncio (sin explicaciones adicionales)."
-                )
+                prompt = STREAM_NO_PROMPT
             else:
                 # Generic fallback prompt for unknown buttons
                 prompt = (
@@ -779,10 +986,8 @@ def process_button_click(custom_id, user_id, username, interaction_token=None):
             "title": f"Respuesta: {resp_label}",
             "description": generated_text,
             "color": 0x00ff00 if "yes" in custom_id else 0xff0000,
-            "timestamp": datetime.utcnow().isoformat(),
-            "footer": {
-                "text": f"RevoWeekend Stream Check"
-            }
+            "timestamp": utc_now_iso(),
+            "footer": BUTTON_RESPONSE_FOOTER
         }
         
         # Post the Gemini-generated announcement to the community channel (text only, no embed)
@@ -823,34 +1028,121 @@ def process_button_click(custom_id, user_id, username, interaction_token=None):
             )
 
 
+# Discord-side errors worth retrying; 429s are already retried (with Retry-After) by the
+# http_session adapter, and any other 4xx is final
+RETRYABLE_STATUSES = frozenset({500, 502, 503, 504})
+
+
+def post_with_backoff(url, payload, timeout=10, max_retries=3):
+    """POST JSON to the Discord API, retrying transient failures with exponential backoff.
+
+    Retries connection errors, timeouts and 5xx, sleeping min(30, 2**attempt * jitter)
+    seconds between attempts (429s are left to the session adapter). Only use it for idempotent
+    calls (e.g. opening a DM channel): a retried message create could post twice.
+    Returns the last response, or raises the last connection error.
+    """
+    for attempt in range(max_retries + 1):
+        resp = None
+        try:
+            resp = http_session.post(url, headers=DISCORD_HEADERS, data=orjson.dumps(payload), timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == max_retries:
+                raise
+            logger.warning(f"POST {url} failed ({e}); retrying")
+        else:
+            if resp.status_code not in RETRYABLE_STATUSES or attempt == max_retries:
+                return resp
+            logger.warning(f"POST {url} returned {resp.status_code}; retrying")
+
+        delay = min(30.0, 2 ** attempt * (1 + random.random() * 0.5))
+        retry_after = resp.headers.get('Retry-After') if resp is not None else None
+        if retry_after:
+            try:
+                delay = min(30.0, float(retry_after))
+            except ValueError:
+                pass
+        time.sleep(delay)
+
+
+# DM channel IDs by user ID; Discord returns the same DM channel for a user every time
+dm_channel_cache = {}
+dm_channel_cache_lock = threading.Lock()
+
+
+def open_dm_channel(user_id):
+    """Return the DM channel ID for a user, opening it via the API only on a cache miss.
+
+    Returns None if the channel could not be opened.
+    """
+    with dm_channel_cache_lock:
+        dm_channel_id = dm_channel_cache.get(user_id)
+    if dm_channel_id:
+        return dm_channel_id
+
+    resp = post_with_backoff("https://discord.com/api/v10/users/@me/channels", {"recipient_id": user_id})
+    if resp.status_code not in (200, 201):
+        logger.error(f"Failed to open DM channel for user {user_id}: {resp.status_code} - {resp.text}")
+        return None
+
+    dm_channel_id = orjson.loads(resp.content).get("id")
+    if not dm_channel_id:
+        logger.error(f"DM channel response missing id: {resp.text}")
+        return None
+
+    with dm_channel_cache_lock:
+        dm_channel_cache[user_id] = dm_channel_id
+    return dm_channel_id
+
+
 def send_dm_to_user(user_id, content, embeds=None, components=None):
     """Open a DM channel with the user and send a message there.
 
     Returns True on success, False otherwise.
     """
     try:
-        headers = {"Authorization": f"Bot {DISCORD_BOT_TOKEN}", "Content-Type": "application/json"}
-        resp = requests.post(
-            "https://discord.com/api/v10/users/@me/channels",
-            headers=headers,
-            json={"recipient_id": user_id},
-            timeout=10
-        )
-        if resp.status_code not in (200, 201):
-            logger.error(f"Failed to open DM channel for user {user_id}: {resp.status_code} - {resp.text}")
-            return False
-
-        dm_channel_id = resp.json().get("id")
+        dm_channel_id = open_dm_channel(user_id)
         if not dm_channel_id:
-            logger.error(f"DM channel response missing id: {resp.text}")
             return False
 
+        # No resend on failure: a retried message create can deliver the DM twice
         return post_to_discord(dm_channel_id, content, embeds=embeds, components=components)
     except Exception as e:
         logger.error(f"Error sending DM to user {user_id}: {e}", exc_info=True)
         return False
 
 
+# Static parts of the weekly prompt message, built once
+WEEKLY_PROMPT_CONTENT = "Hola Golfo! Habrá stream mañana para el RevoWeekend?"
+
+# Discord component structure: an action row (type 1) containing buttons (type 2)
+WEEKLY_PROMPT_COMPONENTS = [
+    {
+        "type": 1,
+        "components": [
+            {
+                "type": 2,
+                "style": 3,  # green (Success)
+                "label": "Ahuevo!",
+                "custom_id": "revo_yes"
+            },
+            {
+                "type": 2,
+                "style": 4,  # red (Danger)
+                "label": "Nel",
+                "custom_id": "revo_no"
+            }
+        ]
+    }
+]
+
+# Optionally include a simple embed for nicer formatting (timestamp added per send)
+WEEKLY_PROMPT_EMBED = {
+    "title": "Weekly Stream Check",
+    "description": "Please indicate whether there will be a live stream on Saturday.",
+    "color": 0x0099ff
+}
+
+
 def send_weekly_prompt():
     """Send the weekly Friday 6pm prompt asking about Saturday's livestream.
 
@@ -861,36 +1153,9 @@ def send_weekly_prompt():
         channel_id = DISCORD_CHANNEL_ID
         logger.info("Sending weekly Friday prompt to channel/user %s", channel_id)
 
-        content = "Hola Golfo! Habrá stream mañana para el RevoWeekend?"
-
-        # Discord component structure: an action row (type 1) containing buttons (type 2)
-        components = [
-            {
-                "type": 1,
-                "components": [
-                    {
-                        "type": 2,
-                        "style": 3,  # green (Success)
-                        "label": "Ahuevo!",
-                        "custom_id": "revo_yes"
-                    },
-                    {
-                        "type": 2,
-                        "style": 4,  # red (Danger)
-                        "label": "Nel",
-                        "custom_id": "revo_no"
-                    }
-                ]
-            }
-        ]
-
-        # Optionally include a simple embed for nicer formatting
-        embed = {
-            "title": "Weekly Stream Check",
-            "description": "Please indicate whether there will be a live stream on Saturday.",
-            "color": 0x0099ff,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        content = WEEKLY_PROMPT_CONTENT
+        components = WEEKLY_PROMPT_COMPONENTS
+        embed = {**WEEKLY_PROMPT_EMBED, "timestamp": utc_now_iso()}
 
         # Try posting directly first (works for guild channels)
         success = post_to_discord(channel_id, content, embeds=[embed], components=components)
@@ -898,25 +1163,42 @@ def send_weekly_prompt():
         # If direct post fails with 404, try opening a DM channel first (for user DMs)
         if not success:
             logger.info("Direct post failed; attempting to open DM channel for user %s", channel_id)
-            dm_response = requests.post(
-                f"https://discord.com/api/v10/users/@me/channels",
-                headers={"Authorization": f"Bot {DISCORD_BOT_TOKEN}", "Content-Type": "application/json"},
-                json={"recipient_id": channel_id},
-                timeout=10
-            )
-            if dm_response.status_code in (200, 201):
-                dm_channel_id = dm_response.json().get("id")
+            dm_channel_id = open_dm_channel(channel_id)
+            if dm_channel_id:
                 logger.info("DM channel opened: %s", dm_channel_id)
                 post_to_discord(dm_channel_id, content, embeds=[embed], components=components)
-            else:
-                logger.error(f"Failed to open DM channel: {dm_response.status_code} - {dm_response.text}")
 
     except Exception as e:
         logger.error(f"Error sending weekly prompt: {e}", exc_info=True)
 
 
+def next_weekly_run(now, weekday, hour, minute):
+    """Next datetime after `now` (tz-aware) that falls on `weekday` (Mon=0) at hour:minute."""
+    run_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    run_at += timedelta(days=(weekday - now.weekday()) % 7)
+    if run_at <= now:
+        run_at += timedelta(days=7)
+    return run_at
+
+
+def weekly_prompt_loop(tz):
+    """Send the weekly prompt every Friday at 18:00 in `tz` (the only scheduled job).
+
+    Runs on a single daemon thread. Sleeps are capped at an hour and compared against
+    UTC timestamps, so DST changes and clock drift can't push the send off schedule.
+    """
+    while True:
+        run_at = next_weekly_run(datetime.now(tz), weekday=4, hour=18, minute=0)
+        while (remaining := run_at.timestamp() - time.time()) > 0:
+            time.sleep(min(remaining, 3600))
+        try:
+            send_weekly_prompt()
+        except Exception as e:
+            logger.error(f"Weekly prompt job failed: {e}", exc_info=True)
+
+
 @app.route('/interactions', methods=['POST'])
-@verify_key_decorator(DISCORD_PUBLIC_KEY)
+@verify_key_decorator(DISCORD_VERIFY_KEY)
 def interactions():
     """
     Main endpoint for Discord interactions.
@@ -938,19 +1220,21 @@ def interactions():
             # Check if it's an AoE3 command
             if command_name.startswith('aoe3_'):
                 logger.info(f"Received AoE3 slash command: /{command_name}")
-                # Import and handle asynchronously
-                import asyncio
-                from aoe3.interaction_handler import handle_aoe3_command
-                
-                # Run async handler in a way that allows background tasks
+                # Run on the shared AoE3 loop; its background tasks keep running after we reply
+                future = asyncio.run_coroutine_threadsafe(handle_aoe3_command(interaction_data), get_aoe3_loop())
                 try:
-                    loop = asyncio.get_event_loop()
-                except RuntimeError:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                
-                # Don't close the loop - let background tasks complete
-                response = loop.run_until_complete(handle_aoe3_command(interaction_data))
+                    response = future.result(timeout=AOE3_COMMAND_TIMEOUT)
+                except concurrent.futures.TimeoutError:
+                    logger.warning(f"AoE3 command /{command_name} missed Discord's response window")
+                    # The user is told to retry, so stop this run before it writes anything else
+                    future.cancel()
+                    response = {
+                        "type": 4,
+                        "data": {
+                            "content": "⏳ El comando tardó demasiado, intenta de nuevo.",
+                            "flags": 64
+                        }
+                    }
                 
                 return jsonify(response)
             
@@ -996,12 +1280,7 @@ def interactions():
             }
             
             # Start background processing
-            thread = threading.Thread(
-                target=process_button_click,
-                args=(custom_id, user_id, username, interaction_token)
-            )
-            thread.daemon = True
-            thread.start()
+            run_in_background(process_button_click, custom_id, user_id, username, interaction_token)
             
             return jsonify(acknowledgment)
         
@@ -1010,11 +1289,11 @@ def interactions():
         
     except Exception as e:
         logger.error(f"Error handling interaction: {str(e)}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+        return static_json_response(INTERNAL_ERROR_RESPONSE_BODY, 500)
 
 
 @app.route('/message', methods=['POST'])
-@verify_key_decorator(DISCORD_PUBLIC_KEY)
+@verify_key_decorator(DISCORD_VERIFY_KEY)
 def message_handler():
     """
     Handler for Discord message events (via gateway webhooks or similar).
@@ -1032,55 +1311,51 @@ def message_handler():
         
         d = data.get('d', {})  # Event data
         
-        # Ignore bot messages
-        author = d.get('author', {})
-        if author.get('bot'):
+        # Ignore bot-authored, anonymous and empty messages before extracting anything else
+        author = d.get('author') or {}
+        user_id = author.get('id')
+        if author.get('bot') or not user_id:
+            return jsonify({"ok": True}), 200
+        
+        content = (d.get('content') or '').strip()
+        if not content:
             return jsonify({"ok": True}), 200
         
-        content = d.get('content', '').strip()
-        user_id = author.get('id')
         username = author.get('username') or author.get('global_name') or 'Unknown'
         guild_id = d.get('guild_id')
         channel_id = d.get('channel_id')
         
-        if not content or not user_id:
-            return jsonify({"ok": True}), 200
-        
-        logger.info(f"Message from {username}: {content[:100]}")
+        logger.info("Message from %s: %.100s", username, content)
         
         # Use TEST_CHANNEL_ID for bot interactions if set, otherwise use the message channel
         response_channel_id = TEST_CHANNEL_ID or channel_id
         
+        content_lower = content.lower()
+        
         # Check if bot is mentioned (tagged)
         mentions = d.get('mentions', [])
-        bot_mentioned = any(m.get('id') == DISCORD_BOT_TOKEN.split('.')[0] for m in mentions)  # Rough check
+        bot_mentioned = bool(mentions) and any(m.get('id') == BOT_TOKEN_ID for m in mentions)  # Rough check
         
         # Also check for direct bot name mentions
-        is_bot_tagged = f"<@{DISCORD_BOT_TOKEN.split('.')[0]}>" in content or "golfobot" in content.lower()
+        is_bot_tagged = BOT_TOKEN_MENTION in content or "golfobot" in content_lower
         
         if is_bot_tagged or bot_mentioned:
             # Bot is tagged - respond with greeting
             greeting = get_mexican_greeting()
-            response_thread = threading.Thread(
-                target=lambda: post_to_discord(response_channel_id, greeting)
-            )
-            response_thread.daemon = True
-            response_thread.start()
+            run_in_background(post_to_discord, response_channel_id, greeting)
             return jsonify({"ok": True}), 200
         
         # Check for voice command patterns
-        content_lower = content.lower()
-        
         # Pattern: "GolfoBot, arma los equipos" or similar
-        if re.search(r'(arma|organiza|separa|mueve).*equipo', content_lower):
-            logger.info(f"Detected team organization command from {username}")
+        if TEAM_COMMAND_KEYWORD in content_lower and TEAM_COMMAND_REGEX.search(content_lower):
+            logger.info("Detected team organization command from %s", username)
             
             # Extract team format if specified (e.g., "2v2", "3v3")
             team_format = parse_team_format(content)
             
             if team_format:
                 team_size, num_teams, total_needed = team_format
-                logger.info(f"Parsed team format: {team_size}v{team_size} ({num_teams} teams, {total_needed} players needed)")
+                logger.info("Parsed team format: %dv%d (%d teams, %d players needed)", team_size, team_size, num_teams, total_needed)
                 
                 # Get members in voice channels
                 members = get_voice_channel_members(guild_id)
@@ -1089,43 +1364,39 @@ def message_handler():
                     # Try alternative: get from message metadata or request actual voice state
                     # For now, return error in persona
                     error_msg = f"{get_error_response_persona()} (No pude detectar quién está en voz, hermano. ¿Estás seguro que todos están conectados?)"
-                    response_thread = threading.Thread(
-                        target=lambda: post_to_discord(response_channel_id, error_msg)
-                    )
-                    response_thread.daemon = True
-                    response_thread.start()
+                    run_in_background(post_to_discord, response_channel_id, error_msg)
                     return jsonify({"ok": True}), 200
                 
                 # Check if we have enough players
                 if len(members) < total_needed:
                     error_msg = f"¡Ay, compa! Necesito {total_needed} jugadores pero solo encontré {len(members)}. Más gente en voz, porfa. 🎤"
-                    response_thread = threading.Thread(
-                        target=lambda: post_to_discord(response_channel_id, error_msg)
-                    )
-                    response_thread.daemon = True
-                    response_thread.start()
+                    run_in_background(post_to_discord, response_channel_id, error_msg)
                     return jsonify({"ok": True}), 200
                 
-                # Randomize teams
+                # Randomize teams: shuffle in place, then deal them out in one pass over the list
                 random.shuffle(members)
-                teams = [members[i*team_size:(i+1)*team_size] for i in range(num_teams)]
+                dealer = iter(members)
+                teams = [list(islice(dealer, team_size)) for _ in range(num_teams)]
                 
                 # Create/get team channels
                 team_channels = create_or_get_team_channels(guild_id, num_teams)
                 
                 if len(team_channels) != num_teams:
                     error_msg = f"Tuve un problema creando los canales, jefe. Intenta de nuevo. 🤷"
-                    response_thread = threading.Thread(
-                        target=lambda: post_to_discord(response_channel_id, error_msg)
-                    )
-                    response_thread.daemon = True
-                    response_thread.start()
+                    run_in_background(post_to_discord, response_channel_id, error_msg)
                     return jsonify({"ok": True}), 200
                 
-                # Move players to team channels
-                for team_idx, team in enumerate(teams):
-                    for member in team:
-                        move_user_to_channel(member['user_id'], guild_id, team_channels[team_idx])
+                # Move players to team channels concurrently (capped to stay inside Discord's
+                # per-route rate limit)
+                moves = [
+                    (member['user_id'], guild_id, team_channels[team_idx])
+                    for team_idx, team in enumerate(teams)
+                    for member in team
+                ]
+                with ThreadPoolExecutor(max_workers=min(TEAM_MOVE_CONCURRENCY, len(moves) or 1)) as pool:
+                    moved = list(pool.map(lambda move: move_user_to_channel(*move), moves))
+                if not all(moved):
+                    invalidate_team_channels(guild_id)
                 
                 # Build team announcement
                 team_lines = []
@@ -1139,26 +1410,18 @@ def message_handler():
                 
                 full_response = f"{formation_response}\n\n{team_announcement}\n\n{moving_response}"
                 
-                response_thread = threading.Thread(
-                    target=lambda: post_to_discord(response_channel_id, full_response)
-                )
-                response_thread.daemon = True
-                response_thread.start()
+                run_in_background(post_to_discord, response_channel_id, full_response)
                 return jsonify({"ok": True}), 200
             else:
                 # Team command but no format parsed
                 error_msg = f"{get_error_response_persona()} Dime en qué formato: 2v2, 3v3, etc. 🎮"
-                response_thread = threading.Thread(
-                    target=lambda: post_to_discord(response_channel_id, error_msg)
-                )
-                response_thread.daemon = True
-                response_thread.start()
+                run_in_background(post_to_discord, response_channel_id, error_msg)
                 return jsonify({"ok": True}), 200
         
         return jsonify({"ok": True}), 200
         
     except Exception as e:
-        logger.error(f"Error handling message: {str(e)}", exc_info=True)
+        logger.error("Error handling message: %s", e, exc_info=True)
         return jsonify({"ok": True}), 200
 
 
@@ -1175,7 +1438,7 @@ def dev_simulate():
     Guarded by `ALLOW_DEV_ENDPOINTS` env var (must be set to 1/true/yes).
     This endpoint returns the same ephemeral acknowledgement JSON used by interactions.
     """
-    if os.environ.get('ALLOW_DEV_ENDPOINTS', '').lower() not in ('1', 'true', 'yes'):
+    if not ALLOW_DEV_ENDPOINTS:
         return jsonify({"error":"Dev endpoints disabled"}), 403
 
     body = request.json or {}
@@ -1195,12 +1458,7 @@ def dev_simulate():
     interaction_token = 'dev-token'
 
     # Start background processing to mimic real interactions
-    thread = threading.Thread(
-        target=process_button_click,
-        args=(custom_id, user_obj['id'], user_obj.get('username', 'DevUser'), interaction_token)
-    )
-    thread.daemon = True
-    thread.start()
+    run_in_background(process_button_click, custom_id, user_obj['id'], user_obj.get('username', 'DevUser'), interaction_token)
 
     # Immediate ephemeral acknowledgement (same shape as real interactions)
     acknowledgment = {
@@ -1216,7 +1474,7 @@ def dev_simulate():
 @app.route('/dev/llm_reply', methods=['POST'])
 def dev_llm_reply():
     """Dev endpoint for voice chat - sends user speech to LLM and returns reply."""
-    if os.environ.get('ALLOW_DEV_ENDPOINTS', '').lower() not in ('1', 'true', 'yes'):
+    if not ALLOW_DEV_ENDPOINTS:
         return jsonify({"error": "Dev endpoints disabled"}), 403
     
     try:
@@ -1261,7 +1519,7 @@ def dev_echo():
     Guarded by `ALLOW_DEV_ENDPOINTS` to avoid accidental exposure.
     Useful to debug Discord webhook delivery and signature headers after restarting the server.
     """
-    if os.environ.get('ALLOW_DEV_ENDPOINTS', '').lower() not in ('1', 'true', 'yes'):
+    if not ALLOW_DEV_ENDPOINTS:
         return jsonify({"error": "Dev endpoints disabled"}), 403
 
     # Collect headers (convert to plain dict)
@@ -1297,7 +1555,7 @@ def dev_simulate_message():
     try:
         logger.info(f"[DEV] /dev/simulate_message endpoint called")
         
-        if os.environ.get('ALLOW_DEV_ENDPOINTS', '').lower() not in ('1', 'true', 'yes'):
+        if not ALLOW_DEV_ENDPOINTS:
             logger.warning("[DEV] Dev endpoints disabled - rejecting request")
             return jsonify({"error": "Dev endpoints disabled"}), 403
         
@@ -1331,11 +1589,7 @@ def dev_simulate_message():
         }
         
         # Process the simulated event in a thread
-        response_thread = threading.Thread(
-            target=lambda: message_handler_internal(event_data)
-        )
-        response_thread.daemon = True
-        response_thread.start()
+        run_in_background(message_handler_internal, event_data)
         
         logger.info("[DEV] Message processing thread started, returning 200")
         
@@ -1357,21 +1611,21 @@ def message_handler_internal(event_data):
     try:
         d = event_data.get('d', {})
         
-        # Ignore bot messages
-        author = d.get('author', {})
-        if author.get('bot'):
+        # Ignore bot-authored, anonymous and empty messages before extracting anything else
+        author = d.get('author') or {}
+        user_id = author.get('id')
+        if author.get('bot') or not user_id:
+            return
+        
+        content = (d.get('content') or '').strip()
+        if not content:
             return
         
-        content = d.get('content', '').strip()
-        user_id = author.get('id')
         username = author.get('username') or author.get('global_name') or 'Unknown'
         guild_id = d.get('guild_id')
         channel_id = d.get('channel_id')
         
-        if not content or not user_id:
-            return
-        
-        logger.info(f"Message from {username}: {content[:100]}")
+        logger.info("Message from %s: %.100s", username, content)
         
         # Use the channel where the message came from (so bot replies in the same channel)
         response_channel_id = channel_id
@@ -1380,26 +1634,26 @@ def message_handler_internal(event_data):
         mentions = d.get('mentions', [])
         mention_ids = [m.get('id') for m in mentions] if mentions else []
 
-        # Prefer explicit bot user id if provided via env var `DISCORD_BOT_USER_ID`
-        bot_user_id = os.environ.get('DISCORD_BOT_USER_ID') or os.environ.get('BOT_USER_ID')
+        content_lower = content.lower()
 
+        # Prefer explicit bot user id if provided via env var `DISCORD_BOT_USER_ID`
         is_bot_tagged = False
         if mention_ids:
-            if bot_user_id:
-                is_bot_tagged = str(bot_user_id) in mention_ids
+            if DISCORD_BOT_USER_ID:
+                is_bot_tagged = DISCORD_BOT_USER_ID in mention_ids
             else:
                 # If no bot id provided, treat any mention as intended for the bot
                 is_bot_tagged = True
 
         # Also accept textual name triggers
-        if not is_bot_tagged and "golfobot" in content.lower():
+        if not is_bot_tagged and "golfobot" in content_lower:
             is_bot_tagged = True
 
         # If the message is dangerous (self-harm instructions or explicit threats),
         # tag moderators and remind the user to behave. Do not roast these messages.
         try:
             if is_dangerous_message(content):
-                logger.info(f"Detected dangerous message from %s; alerting moderators", username)
+                logger.info("Detected dangerous message from %s; alerting moderators", username)
                 mod_mentions = get_moderator_mentions()
                 user_mention = f"<@{user_id}>" if user_id else username
                 pieces = [f"{user_mention}, por favor respeta a los demás y evita incitar daño."]
@@ -1409,16 +1663,16 @@ def message_handler_internal(event_data):
                     pieces.append("Moderadores: por favor revisen este mensaje.")
 
                 alert_msg = " ".join(pieces)
-                logger.info(f"Prepared moderator alert: %s", alert_msg)
+                logger.info("Prepared moderator alert: %s", alert_msg)
                 post_to_discord(response_channel_id, alert_msg)
                 return
         except Exception as e:
-            logger.warning(f"Error during dangerous-message detection/alert: {e}")
+            logger.warning("Error during dangerous-message detection/alert: %s", e)
 
         # If the message appears mean/abusive, reply with a short roast (spicy but non-violent)
         try:
             if is_mean_message(content):
-                logger.info(f"Detected mean message from %s, generating roast", username)
+                logger.info("Detected mean message from %s, generating roast", username)
                 roast = get_roast_response(content, user_id)
                 # Mention the user who sent the mean message (keeps context)
                 try:
@@ -1428,17 +1682,16 @@ def message_handler_internal(event_data):
                 post_to_discord(response_channel_id, f"{mention} {roast}")
                 return
         except Exception as e:
-            logger.warning(f"Error during mean-message detection/roast: {e}")
+            logger.warning("Error during mean-message detection/roast: %s", e)
         if is_bot_tagged or mentions:
             # Generate a short persona-aware reply using the LLM
             try:
                 # Clean content: remove bot mentions to avoid LLM confusion
                 cleaned_content = content
-                for mention in mentions:
-                    mention_id = mention.get('id')
+                for mention_id in mention_ids:
                     if mention_id:
-                        # Remove <@ID> and <@!ID> patterns
-                        cleaned_content = re.sub(rf'<@!?{mention_id}>', '', cleaned_content)
+                        # Remove <@ID> and <@!ID> patterns (plain substring replaces, no regex)
+                        cleaned_content = cleaned_content.replace(f"<@{mention_id}>", "").replace(f"<@!{mention_id}>", "")
                 cleaned_content = cleaned_content.strip()
                 
                 persona_instructions = (
@@ -1453,7 +1706,7 @@ def message_handler_internal(event_data):
                     "Do NOT include any Discord mentions like @username or <@ID> in your reply."
                 )
 
-                logger.info(f"Calling LLM for conversational reply to {username}")
+                logger.info("Calling LLM for conversational reply to %s", username)
                 generated_text = call_llm(prompt, max_tokens=200)
                 if not generated_text:
                     raise RuntimeError("LLM returned empty response")
@@ -1465,7 +1718,7 @@ def message_handler_internal(event_data):
                 # Post LLM-generated reply to the channel
                 post_to_discord(response_channel_id, full_reply)
             except Exception as e:
-                logger.warning(f"LLM conversational reply failed: {e}")
+                logger.warning("LLM conversational reply failed: %s", e)
                 # Fallback to a friendly persona greeting
                 greeting = get_mexican_greeting()
                 post_to_discord(response_channel_id, greeting)
@@ -1473,16 +1726,14 @@ def message_handler_internal(event_data):
             return
         
         # Check for voice command patterns
-        content_lower = content.lower()
-        
-        if re.search(r'(arma|organiza|separa|mueve).*equipo', content_lower):
-            logger.info(f"Detected team organization command from {username}")
+        if TEAM_COMMAND_KEYWORD in content_lower and TEAM_COMMAND_REGEX.search(content_lower):
+            logger.info("Detected team organization command from %s", username)
             
             team_format = parse_team_format(content)
             
             if team_format:
                 team_size, num_teams, total_needed = team_format
-                logger.info(f"Parsed team format: {team_size}v{team_size} ({num_teams} teams, {total_needed} players needed)")
+                logger.info("Parsed team format: %dv%d (%d teams, %d players needed)", team_size, team_size, num_teams, total_needed)
                 
                 # For dev: just acknowledge the command
                 formation_response = get_team_formation_response(f"{team_size}v{team_size}")
@@ -1492,13 +1743,27 @@ def message_handler_internal(event_data):
                 post_to_discord(channel_id, error_msg)
     
     except Exception as e:
-        logger.error(f"Error in message_handler_internal: {str(e)}", exc_info=True)
+        logger.error("Error in message_handler_internal: %s", e, exc_info=True)
 
 
 @app.route('/', methods=['GET'])
 def root():
     """Root endpoint for Railway health checks"""
-    return jsonify({"status": "ok", "service": "GolfoBot Flask Server"}), 200
+    return static_json_response(ROOT_RESPONSE_BODY)
+
+
+# /health timestamp, re-rendered at most once per second however often the probe hits
+HEALTH_TIMESTAMP_TTL = 1.0
+health_timestamp_cache = {'at': float('-inf'), 'value': ''}
+
+
+def get_health_timestamp():
+    """Return the cached UTC ISO timestamp for /health, refreshing it when stale."""
+    now = time.monotonic()
+    if now - health_timestamp_cache['at'] >= HEALTH_TIMESTAMP_TTL:
+        health_timestamp_cache['value'] = utc_now_iso()
+        health_timestamp_cache['at'] = now
+    return health_timestamp_cache['value']
 
 
 @app.route('/health', methods=['GET'])
@@ -1506,20 +1771,20 @@ def health():
     """Health check endpoint with system status"""
     return jsonify({
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": get_health_timestamp(),
         "channel_id": DISCORD_CHANNEL_ID
     }), 200
 
 
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({"error": "Not found"}), 404
+    return static_json_response(NOT_FOUND_RESPONSE_BODY, 404)
 
 
 @app.errorhandler(500)
 def internal_error(error):
-    logger.error(f"Internal server error: {str(error)}")
-    return jsonify({"error": "Internal server error"}), 500
+    logger.error("Internal server error: %s", error)
+    return static_json_response(INTERNAL_ERROR_RESPONSE_BODY, 500)
 
 
 if __name__ == '__main__':
@@ -1538,37 +1803,39 @@ if __name__ == '__main__':
     
     missing_vars = [var for var in required_vars if not os.environ.get(var)]
     if missing_vars:
-        logger.error(f"Missing required environment variables: {', '.join(missing_vars)}")
+        logger.error("Missing required environment variables: %s", ', '.join(missing_vars))
         exit(1)
     
     # Log which LLM is configured
     if GROQ_API_KEY:
-        logger.info(f"Using Groq API with model: {GROQ_MODEL}")
+        logger.info("Using Groq API with model: %s", GROQ_MODEL)
     if GEMINI_API_KEY:
-        logger.info(f"Gemini API available as fallback with model: {GEMINI_MODEL}")
+        logger.info("Gemini API available as fallback with model: %s", GEMINI_MODEL)
     
     logger.info("=" * 50)
     logger.info("Discord Interaction Handler Starting")
-    logger.info(f"Channel ID: {DISCORD_CHANNEL_ID}")
-    logger.info(f"Registered buttons: {', '.join(BUTTON_CONFIGS.keys())}")
+    logger.info("Channel ID: %s", DISCORD_CHANNEL_ID)
+    logger.info("Registered buttons: %s", ", ".join(BUTTON_CONFIGS))
     logger.info("=" * 50)
     # Scheduler timezone: use SCHEDULE_TZ env or fall back to system TZ or UTC
     tz_name = os.environ.get('SCHEDULE_TZ') or os.environ.get('TZ') or 'UTC'
     try:
         tz = ZoneInfo(tz_name)
     except Exception:
-        logger.warning(f"Invalid timezone '{tz_name}', falling back to UTC")
+        logger.warning("Invalid timezone '%s', falling back to UTC", tz_name)
         tz = ZoneInfo('UTC')
 
-    # Start background scheduler to send message every Friday at 18:00 (6pm) in the configured tz
-    try:
-        scheduler = BackgroundScheduler(timezone=tz)
-        trigger = CronTrigger(day_of_week='fri', hour=18, minute=0, timezone=tz)
-        scheduler.add_job(send_weekly_prompt, trigger=trigger, id='weekly_friday_prompt')
-        scheduler.start()
-        logger.info(f"Scheduled weekly Friday prompt at 18:00 {tz_name}")
-    except Exception as e:
-        logger.error(f"Failed to start scheduler: {e}", exc_info=True)
+    # Start background scheduler to send message every Friday at 18:00 (6pm) in the configured tz.
+    # With several replicas, set RUN_WEEKLY_PROMPT=0 on all but one to avoid duplicate posts.
+    if os.environ.get('RUN_WEEKLY_PROMPT', '1').lower() in ('1', 'true', 'yes'):
+        try:
+            scheduler = threading.Thread(target=weekly_prompt_loop, args=(tz,), name='weekly_friday_prompt', daemon=True)
+            scheduler.start()
+            logger.info("Scheduled weekly Friday prompt at 18:00 %s", tz_name)
+        except Exception as e:
+            logger.error("Failed to start scheduler: %s", e, exc_info=True)
+    else:
+        logger.info("RUN_WEEKLY_PROMPT is disabled; this instance won't send the weekly prompt")
 
     # For testing: optionally send the scheduled prompt immediately when the server starts
     if os.environ.get('SEND_PROMPT_ON_START', '').lower() in ('1', 'true', 'yes'):
@@ -1577,7 +1844,7 @@ if __name__ == '__main__':
             send_weekly_prompt()
             logger.info("SEND_PROMPT_ON_START enabled — sent prompt immediately on startup")
         except Exception as e:
-            logger.error(f"Error sending immediate prompt on start: {e}", exc_info=True)
+            logger.error("Error sending immediate prompt on start: %s", e, exc_info=True)
 
     # Use Railway's PORT environment variable if available, otherwise default to 5000
     port = int(os.environ.get('PORT', 5000))
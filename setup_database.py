@@ -4,6 +4,7 @@ Run this locally, it will connect to Railway's PostgreSQL and create all tables.
 """
 import asyncio
 import os
+from urllib.parse import urlsplit, urlunsplit
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,21 +24,25 @@ async def setup_database():
         return
     
     # Fix URL format if needed (Railway sometimes uses postgres:// but we need postgresql://)
-    if database_url.startswith('postgres://'):
-        database_url = database_url.replace('postgres://', 'postgresql://', 1)
+    url_parts = urlsplit(database_url)
+    if url_parts.scheme == 'postgres':
+        url_parts = url_parts._replace(scheme='postgresql')
+        database_url = urlunsplit(url_parts)
     
     print(f"📊 Connecting to database...")
-    print(f"Host: {database_url.split('@')[1].split('/')[0] if '@' in database_url else 'unknown'}")
+    host = f"{url_parts.hostname}:{url_parts.port}" if url_parts.port else url_parts.hostname
+    print(f"Host: {host or 'unknown'}")
     
     # Import database module
-    from aoe3.database import Base, engine
+    from aoe3.database import Base
     from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
     
-    # Create engine with the DATABASE_URL
+    # One-shot engine for the DDL: no pool to keep warm
     db_engine = create_async_engine(
         database_url,
         echo=False,
-        pool_pre_ping=True
+        poolclass=NullPool
     )
     
     print("🔨 Creating database tables...")